@@ -0,0 +1,24 @@
+# Generated by Django 5.1.4 on 2026-10-15 10:27
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # Indexes are built CONCURRENTLY so writes to the table are not blocked
+    atomic = False
+
+    dependencies = [
+        ('category', '0001_initial'),
+        ('transaction', '0003_alter_transaction_description'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='transaction',
+            index=models.Index(fields=['user', '-date', '-id'], include=('amount', 'transaction_type', 'category'), name='tx_user_date_id'),
+        ),
+    ]
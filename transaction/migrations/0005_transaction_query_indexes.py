@@ -0,0 +1,24 @@
+# Generated by Django 5.1.4 on 2026-10-15 10:28
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # Indexes are built CONCURRENTLY so writes to the table are not blocked
+    atomic = False
+
+    dependencies = [
+        ('category', '0001_initial'),
+        ('transaction', '0004_transaction_user_date_id_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='transaction',
+            index=models.Index(fields=['user', 'category', '-date'], include=('id', 'amount', 'transaction_type'), name='tx_user_category_date'),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.1.4 on 2026-10-15 10:33
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def backfill_daily_summaries(apps, schema_editor):
+    Transaction = apps.get_model('transaction', 'Transaction')
+    DayUserSummary = apps.get_model('transaction', 'DayUserSummary')
+    rows = (
+        Transaction.objects
+        .values('user_id', 'date')
+        .annotate(
+            debit_total=Sum('amount', filter=Q(transaction_type='debit')),
+            credit_total=Sum('amount', filter=Q(transaction_type='credit')),
+            tx_count=Count('id'),
+        )
+        .order_by()
+    )
+    DayUserSummary.objects.bulk_create(
+        DayUserSummary(
+            user_id=row['user_id'],
+            day=row['date'],
+            debit_total=row['debit_total'] or 0,
+            credit_total=row['credit_total'] or 0,
+            tx_count=row['tx_count'],
+        )
+        for row in rows
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transaction', '0005_transaction_query_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DayUserSummary',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('day', models.DateField()),
+                ('debit_total', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('credit_total', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('tx_count', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_summaries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Daily user summary',
+                'verbose_name_plural': 'Daily user summaries',
+                'unique_together': {('user', 'day')},
+            },
+        ),
+        migrations.RunPython(backfill_daily_summaries, migrations.RunPython.noop),
+    ]
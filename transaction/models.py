@@ -1,4 +1,5 @@
 from django.db import models
+from django.db import transaction as db_transaction
 from user.models import CustomUser
 from category.models import Category
 import uuid
@@ -34,9 +35,48 @@ class Transaction(models.Model):
     def __str__(self):
         return f"Transaction {self.id} - {self.transaction_type} - {self.amount}"
 
+    def save(self, *args, **kwargs):
+        # The row write and the DayUserSummary adjustments made by the
+        # pre_save/post_save handlers in transaction/signals.py commit or
+        # roll back together (deletes are already atomic in Django's collector)
+        with db_transaction.atomic():
+            super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = "Transaction"
         verbose_name_plural = "Transactions"
+        indexes = [
+            # INCLUDE columns let the summary aggregates run as index-only scans (Postgres)
+            models.Index(
+                fields=['user', '-date', '-id'],
+                name='tx_user_date_id',
+                include=['amount', 'transaction_type', 'category'],
+            ),
+            models.Index(
+                fields=['user', 'category', '-date'],
+                name='tx_user_category_date',
+                include=['id', 'amount', 'transaction_type'],
+            ),
+        ]
 
 
+class DayUserSummary(models.Model):
+    """
+    Running debit/credit totals per user and day, kept in sync with
+    Transaction by the handlers in transaction/signals.py. SUM and COUNT
+    compose, so any month or date range is a roll-up of these rows.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="daily_summaries")
+    day = models.DateField()
+    debit_total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    credit_total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    tx_count = models.IntegerField(default=0)
 
+    def __str__(self):
+        return f"Summary {self.user_id} - {self.day}"
+
+    class Meta:
+        verbose_name = "Daily user summary"
+        verbose_name_plural = "Daily user summaries"
+        unique_together = ("user", "day")
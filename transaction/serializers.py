@@ -1,15 +1,18 @@
+from django.utils import timezone
 from rest_framework import serializers
 from .models import Transaction
 
 class TransactionSerializer(serializers.ModelSerializer):
-    date = serializers.DateField(required=False)  
+    date = serializers.DateField(default=lambda: timezone.now().date())
     class Meta:
         model = Transaction
         fields = '__all__'
-    def create(self, validated_data):
-        # Get the user from the request context
-        request = self.context.get('request')
-        if request:
-            user = request.user  # Get the logged-in user
-            validated_data['user'] = user
-        return super().create(validated_data)
+        read_only_fields = ('user',)
+
+
+class SummaryQuerySerializer(serializers.Serializer):
+    """
+    Validates the optional year/month query parameters of the summary views
+    """
+    year = serializers.IntegerField(min_value=1000, max_value=9999, required=False)
+    month = serializers.IntegerField(min_value=1, max_value=12, required=False)
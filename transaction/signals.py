@@ -0,0 +1,135 @@
+import uuid
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import transaction as db_transaction
+from django.db.models import F
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from category.models import Category
+from .models import Transaction, DayUserSummary
+
+SUMMARY_CACHE_VERSION_KEY = 'txsum-version:{}'
+# Summaries embed category names, and shared categories (user=None) appear
+# for every user, so changes to those invalidate through one global token
+CATEGORY_CACHE_VERSION_KEY = 'txsum-category-version'
+
+
+def summary_cache_version(user_id):
+    """
+    Token embedded in cached summary keys; a new one is issued whenever the
+    user's transactions or any category change, so stale summaries are never
+    read again
+    """
+    user_token = cache.get_or_set(
+        SUMMARY_CACHE_VERSION_KEY.format(user_id), lambda: uuid.uuid4().hex, None
+    )
+    category_token = cache.get_or_set(
+        CATEGORY_CACHE_VERSION_KEY, lambda: uuid.uuid4().hex, None
+    )
+    return f"{user_token}.{category_token}"
+
+
+def summary_contribution(user_id, day, transaction_type, amount):
+    """
+    Normalised (user_id, day, transaction_type, amount) a transaction adds to
+    its DayUserSummary row
+    """
+    return (
+        user_id,
+        Transaction._meta.get_field('date').to_python(day),
+        transaction_type,
+        Decimal(str(amount)),
+    )
+
+
+def apply_to_daily_summary(user_id, day, transaction_type, amount, sign):
+    """
+    Add (sign=1) or remove (sign=-1) one transaction from its day's totals
+    """
+    changes = {'tx_count': F('tx_count') + sign}
+    if transaction_type == 'debit':
+        changes['debit_total'] = F('debit_total') + sign * amount
+    elif transaction_type == 'credit':
+        changes['credit_total'] = F('credit_total') + sign * amount
+
+    lookup = {'user_id': user_id, 'day': day}
+    with db_transaction.atomic():
+        # Removals only touch an existing row, so cascading user deletes
+        # never recreate a summary for the user being deleted
+        if sign > 0:
+            DayUserSummary.objects.get_or_create(**lookup)
+        DayUserSummary.objects.filter(**lookup).update(**changes)
+    invalidate_user_summaries(user_id)
+
+
+def invalidate_user_summaries(user_id):
+    """
+    Drop the user's cached summaries once the current transaction commits
+    """
+    db_transaction.on_commit(
+        lambda: cache.delete(SUMMARY_CACHE_VERSION_KEY.format(user_id))
+    )
+
+
+@receiver(pre_save, sender=Transaction)
+def remember_previous_values(sender, instance, **kwargs):
+    # Updates need the stored row so its old contribution can be removed.
+    # Transaction.save() runs inside atomic(), so the row lock is held until
+    # post_save has adjusted the summaries and concurrent updates serialise.
+    instance._summary_previous = None
+    instance._summary_previous_category_id = None
+    if instance._state.adding:
+        return
+    previous = (
+        Transaction.objects.select_for_update()
+        .filter(pk=instance.pk)
+        .values_list('user_id', 'date', 'transaction_type', 'amount', 'category_id')
+        .first()
+    )
+    if previous:
+        instance._summary_previous = summary_contribution(*previous[:4])
+        instance._summary_previous_category_id = previous[4]
+
+
+@receiver(post_save, sender=Transaction)
+def update_summary_on_save(sender, instance, **kwargs):
+    current = summary_contribution(
+        instance.user_id, instance.date, instance.transaction_type, instance.amount
+    )
+    previous = getattr(instance, '_summary_previous', None)
+    if previous == current:
+        # The daily totals are unchanged, but the cached per-category
+        # breakdown is stale if the transaction moved to another category
+        if instance.category_id != getattr(instance, '_summary_previous_category_id', None):
+            invalidate_user_summaries(instance.user_id)
+        return
+    if previous:
+        apply_to_daily_summary(*previous, sign=-1)
+    apply_to_daily_summary(*current, sign=1)
+
+
+@receiver(post_delete, sender=Transaction)
+def update_summary_on_delete(sender, instance, **kwargs):
+    apply_to_daily_summary(
+        *summary_contribution(
+            instance.user_id, instance.date, instance.transaction_type, instance.amount
+        ),
+        sign=-1,
+    )
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_summaries_on_category_change(sender, instance, created=False, **kwargs):
+    # Renames, soft deletes and deletes (which null out transaction.category)
+    # change the per-category breakdown; a new category is not referenced yet
+    if created:
+        return
+    if instance.user_id is None:
+        # Shared categories can appear in every user's summary
+        key = CATEGORY_CACHE_VERSION_KEY
+    else:
+        key = SUMMARY_CACHE_VERSION_KEY.format(instance.user_id)
+    db_transaction.on_commit(lambda: cache.delete(key))
@@ -1,3 +1,406 @@
-from django.test import TestCase
+import datetime
+from decimal import Decimal
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from category.models import Category
+from expense_tracker.renderers import OrjsonRenderer
+from user.models import CustomUser
+from .models import Transaction, DayUserSummary
+from .signals import summary_cache_version
+
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+class TransactionTestCase(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            "owner@example.com", "owner", "password", first_name="Owner", last_name="User"
+        )
+        self.category = Category.objects.create(name="Food", user=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_transaction(self, amount, transaction_type="debit", date=None):
+        return Transaction.objects.create(
+            user=self.user,
+            category=self.category,
+            amount=Decimal(amount),
+            transaction_type=transaction_type,
+            payment_method="cash",
+            date=date or datetime.date(2024, 5, 10),
+        )
+
+    def create_other_user(self):
+        return CustomUser.objects.create_user(
+            "other@example.com", "other", "password", first_name="Other", last_name="User"
+        )
+
+    def daily_totals(self, day, user=None):
+        summary = DayUserSummary.objects.filter(user=user or self.user, day=day).first()
+        if summary is None:
+            return None
+        return summary.debit_total, summary.credit_total, summary.tx_count
+
+
+class DayUserSummaryTests(TransactionTestCase):
+    def test_create_adds_to_daily_totals(self):
+        self.create_transaction("10.00")
+        self.create_transaction("4.50", transaction_type="credit")
+
+        self.assertEqual(
+            self.daily_totals(datetime.date(2024, 5, 10)),
+            (Decimal("10.00"), Decimal("4.50"), 2),
+        )
+
+    def test_update_moves_contribution(self):
+        transaction = self.create_transaction("10.00")
+        self.create_transaction("1.00")
+
+        transaction.date = datetime.date(2024, 6, 1)
+        transaction.transaction_type = "credit"
+        transaction.amount = Decimal("7.25")
+        transaction.save()
+
+        self.assertEqual(
+            self.daily_totals(datetime.date(2024, 5, 10)),
+            (Decimal("1.00"), Decimal("0.00"), 1),
+        )
+        self.assertEqual(
+            self.daily_totals(datetime.date(2024, 6, 1)),
+            (Decimal("0.00"), Decimal("7.25"), 1),
+        )
+
+    def test_update_of_untracked_fields_leaves_totals(self):
+        transaction = self.create_transaction("10.00")
+
+        transaction.description = "lunch"
+        transaction.save()
+
+        self.assertEqual(
+            self.daily_totals(datetime.date(2024, 5, 10)),
+            (Decimal("10.00"), Decimal("0.00"), 1),
+        )
+
+    def test_delete_removes_from_daily_totals(self):
+        transaction = self.create_transaction("10.00")
+        self.create_transaction("3.00")
+
+        response = self.client.delete(
+            reverse("transaction-detail", kwargs={"pk": transaction.id})
+        )
+
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(
+            self.daily_totals(datetime.date(2024, 5, 10)),
+            (Decimal("3.00"), Decimal("0.00"), 1),
+        )
+
+
+class TransactionListPaginationTests(TransactionTestCase):
+    def test_cursor_pages_return_every_row_once(self):
+        # Several rows share a date so the cursor has to break ties
+        expected = {
+            str(self.create_transaction(i + 1, date=datetime.date(2024, 5, 1 + i % 3)).id)
+            for i in range(11)
+        }
+
+        seen = []
+        url = reverse("transaction-list-create") + "?page_size=4"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(row["id"] for row in response.json()["results"])
+            url = response.json()["next"]
+
+        self.assertEqual(len(seen), len(expected))
+        self.assertEqual(set(seen), expected)
+
+
+class TransactionListFilterTests(TransactionTestCase):
+    def test_unknown_filters_are_ignored(self):
+        self.create_transaction("10.00")
+        response = self.client.get(
+            reverse("transaction-list-create"), {"user__password__startswith": "x"}
+        )
+        self.assertEqual(len(response.json()["results"]), 1)
+
+    def test_filters_are_coerced(self):
+        self.create_transaction("10.00", date=datetime.date(2024, 5, 1))
+        self.create_transaction("20.00", date=datetime.date(2024, 6, 1))
+
+        response = self.client.get(
+            reverse("transaction-list-create"), {"date__gte": "2024-05-15"}
+        )
+        self.assertEqual([row["amount"] for row in response.json()["results"]], ["20.00"])
+
+    def test_invalid_filter_value_is_rejected(self):
+        response = self.client.get(
+            reverse("transaction-list-create"), {"category": "not-a-uuid"}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"error": "Invalid category parameter"})
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class TransactionSummaryViewTests(TransactionTestCase):
+    def get_summary(self):
+        return self.client.get(
+            reverse("transaction-summary"), {"year": 2024, "month": 5}
+        ).json()
+
+    def test_summary_reflects_writes_after_caching(self):
+        self.create_transaction("10.00")
+        self.assertEqual(self.get_summary()["total_expense"], 10.0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("transaction-list-create"),
+                {
+                    "amount": "5.00",
+                    "transaction_type": "credit",
+                    "payment_method": "cash",
+                    "date": "2024-05-12",
+                },
+                format="json",
+            )
+        self.assertEqual(response.status_code, 201)
+
+        summary = self.get_summary()
+        self.assertEqual(summary["total_transactions"], 2)
+        self.assertEqual(summary["total_income"], 5.0)
+        self.assertEqual(summary["net_amount"], -5.0)
+
+    def test_summary_reflects_category_only_update(self):
+        transaction = self.create_transaction("10.00")
+        travel = Category.objects.create(name="Travel", user=self.user)
+        self.get_summary()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put(
+                reverse("transaction-detail", kwargs={"pk": transaction.id}),
+                {"category": str(travel.id)},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 200)
+
+        summary = self.get_summary()
+        names = [row["category__name"] for row in summary["transactions_by_category"]]
+        self.assertEqual(names, ["Travel"])
+        self.assertEqual(summary["total_expense"], 10.0)
+        self.assertEqual(
+            self.daily_totals(datetime.date(2024, 5, 10)),
+            (Decimal("10.00"), Decimal("0.00"), 1),
+        )
+
+    def test_summary_reflects_own_category_rename(self):
+        self.create_transaction("10.00")
+        self.get_summary()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.name = "Groceries"
+            self.category.save()
+
+        names = [row["category__name"] for row in self.get_summary()["transactions_by_category"]]
+        self.assertEqual(names, ["Groceries"])
+
+    def test_summary_reflects_shared_category_rename(self):
+        shared = Category.objects.create(name="Rent")
+        transaction = self.create_transaction("10.00")
+        transaction.category = shared
+        transaction.save()
+        self.get_summary()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            shared.name = "Housing"
+            shared.save()
+
+        names = [row["category__name"] for row in self.get_summary()["transactions_by_category"]]
+        self.assertEqual(names, ["Housing"])
+
+    def test_other_users_categories_keep_cache(self):
+        other = self.create_other_user()
+        version = summary_cache_version(self.user.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            category = Category.objects.create(name="Travel", user=other)
+        with self.captureOnCommitCallbacks(execute=True):
+            category.name = "Trips"
+            category.save()
+
+        self.assertEqual(summary_cache_version(self.user.id), version)
+
+
+    def test_invalid_query_params_are_rejected(self):
+        for params in ({"month": 13}, {"year": "abc"}):
+            response = self.client.get(reverse("transaction-summary"), params)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn(next(iter(params)), response.json())
+
+class TransactionOwnershipTests(TransactionTestCase):
+    def test_post_ignores_user_in_payload(self):
+        other = self.create_other_user()
+
+        response = self.client.post(
+            reverse("transaction-list-create"),
+            {
+                "amount": "5.00",
+                "transaction_type": "debit",
+                "payment_method": "cash",
+                "user": str(other.id),
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["user"], str(self.user.id))
+        self.assertFalse(Transaction.objects.filter(user=other).exists())
+
+    def test_put_ignores_user_in_payload(self):
+        other = self.create_other_user()
+        transaction = self.create_transaction("10.00")
+
+        response = self.client.put(
+            reverse("transaction-detail", kwargs={"pk": transaction.id}),
+            {"user": str(other.id), "description": "moved"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        transaction.refresh_from_db()
+        self.assertEqual(transaction.user_id, self.user.id)
+        self.assertEqual(transaction.description, "moved")
+
+    def test_other_users_transaction_is_not_found(self):
+        other = self.create_other_user()
+        transaction = Transaction.objects.create(
+            user=other,
+            amount=Decimal("8.00"),
+            transaction_type="debit",
+            payment_method="cash",
+            date=datetime.date(2024, 5, 10),
+        )
+        url = reverse("transaction-detail", kwargs={"pk": transaction.id})
+        not_found = {"error": "Transaction not found or you do not have permission"}
+
+        for response in (self.client.get(url), self.client.delete(url)):
+            self.assertEqual(response.status_code, 404)
+            self.assertEqual(response.json(), not_found)
+
+        self.assertTrue(Transaction.objects.filter(pk=transaction.pk).exists())
+        self.assertEqual(
+            self.daily_totals(datetime.date(2024, 5, 10), user=other),
+            (Decimal("8.00"), Decimal("0.00"), 1),
+        )
+
+
+class CategoryTransactionSummaryViewTests(TransactionTestCase):
+    def get_category_summary(self, category=None, **params):
+        return self.client.get(
+            reverse(
+                "category-transaction-summary",
+                kwargs={"category_uuid": (category or self.category).id},
+            ),
+            {"year": 2024, **params},
+        )
+
+    def test_totals_cover_only_the_category(self):
+        self.create_transaction("10.00")
+        self.create_transaction("2.50")
+        self.create_transaction("4.00", transaction_type="credit")
+        other_category = Category.objects.create(name="Travel", user=self.user)
+        Transaction.objects.create(
+            user=self.user,
+            category=other_category,
+            amount=Decimal("99.00"),
+            transaction_type="debit",
+            payment_method="cash",
+            date=datetime.date(2024, 5, 10),
+        )
+
+        response = self.get_category_summary()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/json")
+        summary = response.json()
+        self.assertEqual(summary["category_uuid"], str(self.category.id))
+        self.assertEqual(summary["total_transactions"], 3)
+        self.assertEqual(summary["total_amount"], 16.5)
+        self.assertEqual(
+            summary["transactions_by_type"],
+            {
+                "debit": {"total_amount": 12.5, "count": 2},
+                "credit": {"total_amount": 4.0, "count": 1},
+            },
+        )
+
+    def test_month_filter(self):
+        self.create_transaction("10.00", date=datetime.date(2024, 5, 10))
+        self.create_transaction("20.00", date=datetime.date(2024, 6, 10))
+
+        summary = self.get_category_summary(month=6).json()
+
+        self.assertEqual(summary["total_transactions"], 1)
+        self.assertEqual(summary["total_amount"], 20.0)
+
+    def test_invalid_month_is_rejected(self):
+        response = self.get_category_summary(month=0)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("month", response.json())
+
+    def test_details_are_cursor_paginated(self):
+        expected = {
+            str(self.create_transaction(i + 1, date=datetime.date(2024, 5, 1 + i % 4)).id)
+            for i in range(9)
+        }
+
+        first = self.get_category_summary(page_size=4).json()
+        self.assertEqual(len(first["transactions_details"]), 4)
+        self.assertIsNone(first["previous"])
+        # Totals always cover the whole range, not just the page
+        self.assertEqual(first["total_transactions"], 9)
+
+        seen = [row["id"] for row in first["transactions_details"]]
+        url = first["next"]
+        while url:
+            page = self.client.get(url).json()
+            self.assertEqual(page["total_transactions"], 9)
+            seen.extend(row["id"] for row in page["transactions_details"])
+            url = page["next"]
+
+        self.assertEqual(len(seen), len(expected))
+        self.assertEqual(set(seen), expected)
+
+
+class OrjsonRendererTests(TestCase):
+    def assertRendersLikeJSONRenderer(self, data, accepted_media_type=None):
+        self.assertEqual(
+            OrjsonRenderer().render(data, accepted_media_type),
+            JSONRenderer().render(data, accepted_media_type),
+        )
+
+    def test_output_matches_json_renderer(self):
+        self.assertRendersLikeJSONRenderer({
+            "amount": Decimal("12.50"),
+            "date": datetime.date(2024, 5, 10),
+            "created_at": datetime.datetime(2024, 5, 10, 8, 30, 1, 123456, tzinfo=datetime.timezone.utc),
+            "rows": [{"count": 2, "name": "Food"}],
+            "empty": None,
+        })
+
+    def test_indent_is_honoured(self):
+        data = {"rows": [{"count": 2}]}
+        self.assertRendersLikeJSONRenderer(data, "application/json; indent=4")
+        self.assertIn(b"\n    ", OrjsonRenderer().render(data, "application/json; indent=4"))
+
+    def test_line_separators_are_escaped(self):
+        data = {"description": "line\u2028para\u2029end"}
+        self.assertRendersLikeJSONRenderer(data)
+        self.assertIn(b"\\u2028", OrjsonRenderer().render(data))
+
+    def test_integers_beyond_64_bits_render(self):
+        self.assertRendersLikeJSONRenderer({"big": 2 ** 70, "negative": -(2 ** 70)})
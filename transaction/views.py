@@ -2,22 +2,51 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.exceptions import NotFound
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.pagination import PageNumberPagination
-from django.db.models import Sum, Count
+from rest_framework.pagination import CursorPagination
+from django.db.models import Sum, Count, Q, Value, DecimalField
+from django.db.models.functions import Coalesce
 from django.utils import timezone
-from datetime import datetime
+from django.core.cache import cache
+from datetime import datetime, date
 from django.db.models.functions import TruncMonth ,TruncYear
 import uuid
 
-from .models import Transaction
-from .serializers import TransactionSerializer
+from .models import Transaction, DayUserSummary
+from .signals import summary_cache_version
+from .serializers import TransactionSerializer, SummaryQuerySerializer
 from category.models import Category
-class StandardResultsSetPagination(PageNumberPagination):
-    page_size = 2
+
+TRANSACTION_NOT_FOUND = {'error': 'Transaction not found or you do not have permission'}
+
+# Query params accepted as list filters, mapped to the type they are coerced to
+ALLOWED_FILTERS = {
+    'transaction_type': str,
+    'payment_method': str,
+    'category': uuid.UUID,
+    'date': date.fromisoformat,
+    'date__gte': date.fromisoformat,
+    'date__lte': date.fromisoformat,
+}
+
+# Seconds a computed monthly summary is served from the cache
+SUMMARY_CACHE_TIMEOUT = 300
+
+
+class StandardResultsSetPagination(CursorPagination):
+    # Keyset pagination on (date, id): cost stays constant however deep the page
+    page_size = 20
+    ordering = ('-date', '-id')
     page_size_query_param = 'page_size'
     max_page_size = 100
 
+
+class TransactionDetailsPagination(StandardResultsSetPagination):
+    # Bounds the transactions_details list of the category summary
+    page_size = 100
+    max_page_size = 1000
+
 class TransactionListCreateView(APIView):
     """
     API endpoint for listing and creating transactions
@@ -26,12 +55,19 @@ class TransactionListCreateView(APIView):
     pagination_class = StandardResultsSetPagination
 
     def get(self, request):
-        # Filter transactions for the authenticated user\
+        # Filter transactions for the authenticated user
         filters = {}
         for param, value in request.query_params.items():
-            if param not in ['page', 'page_size']:
-                filters[param] = value
-        queryset = Transaction.objects.filter(user=request.user).order_by('-date')
+            if param not in ALLOWED_FILTERS:
+                continue
+            try:
+                filters[param] = ALLOWED_FILTERS[param](value)
+            except ValueError:
+                return Response(
+                    {'error': f'Invalid {param} parameter'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        queryset = Transaction.objects.filter(user=request.user)
         if filters:
             queryset = queryset.filter(**filters)
         else:
@@ -44,14 +80,10 @@ class TransactionListCreateView(APIView):
         return paginator.get_paginated_response(serializer.data)
 
     def post(self, request):
-        # Add the current user to the transaction data
-        transaction_data = request.data.copy()
-        transaction_data['user'] = request.user.id
-        if 'date' not in transaction_data:
-            transaction_data['date'] = timezone.now().date()
-        serializer = TransactionSerializer(data=transaction_data)
+        serializer = TransactionSerializer(data=request.data)
         if serializer.is_valid():
-            serializer.save()
+            # The owner always comes from the request, never from the payload
+            serializer.save(user=request.user)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -68,46 +100,28 @@ class TransactionDetailView(APIView):
         try:
             return Transaction.objects.get(id=pk, user=user)
         except Transaction.DoesNotExist:
-            return None
+            raise NotFound(TRANSACTION_NOT_FOUND)
 
     def get(self, request, pk):
         transaction = self.get_object(pk, request.user)
-        if not transaction:
-            return Response(
-                {'error': 'Transaction not found or you do not have permission'},
-                status=status.HTTP_404_NOT_FOUND
-            )
-        
         serializer = TransactionSerializer(transaction)
         return Response(serializer.data)
 
     def put(self, request, pk):
         transaction = self.get_object(pk, request.user)
-        if not transaction:
-            return Response(
-                {'error': 'Transaction not found or you do not have permission'},
-                status=status.HTTP_404_NOT_FOUND
-            )
-        
-        # Prevent changing the user of the transaction
-        update_data = request.data.copy()
-        update_data.pop('user', None)
-        
-        serializer = TransactionSerializer(transaction, data=update_data, partial=True)
+
+        # 'user' is read-only on the serializer, so ownership cannot change
+        serializer = TransactionSerializer(transaction, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     def delete(self, request, pk):
-        transaction = self.get_object(pk, request.user)
-        if not transaction:
-            return Response(
-                {'error': 'Transaction not found or you do not have permission'},
-                status=status.HTTP_404_NOT_FOUND
-            )
-        
-        transaction.delete()
+        # Ownership check and delete in one statement, no separate lookup
+        deleted, _ = Transaction.objects.filter(id=pk, user=request.user).delete()
+        if not deleted:
+            raise NotFound(TRANSACTION_NOT_FOUND)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 class TransactionSummaryView(APIView):
@@ -118,27 +132,39 @@ class TransactionSummaryView(APIView):
 
     def get(self, request):
         # Get query parameters
-        month = request.query_params.get('month',timezone.now().month)
+        query = SummaryQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        now = timezone.now()
+        year = query.validated_data.get('year', now.year)
+        month = query.validated_data.get('month', now.month)
 
-        # Base queryset filtered by user
-        queryset = Transaction.objects.filter(user=request.user,date__month=month)
+        cache_key = f"txsum:{request.user.id}:{year}:{month}:{summary_cache_version(request.user.id)}"
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return Response(cached)
 
+        # Roll the month up from the daily buckets kept by transaction/signals.py
+        zero = Value(0, output_field=DecimalField())
+        totals = DayUserSummary.objects.filter(
+            user=request.user, day__year=year, day__month=month
+        ).aggregate(
+            debit_total=Coalesce(Sum('debit_total'), zero),
+            credit_total=Coalesce(Sum('credit_total'), zero),
+            tx_count=Coalesce(Sum('tx_count'), 0),
+        )
+        total_expense = totals['debit_total']
+        total_income = totals['credit_total']
 
+        # Base queryset filtered by user
+        queryset = Transaction.objects.filter(
+            user=request.user, date__year=year, date__month=month
+        )
 
-        # Aggregate calculations
         summary = {
-            'total_transactions': queryset.count(),
-            'total_expense': queryset.filter(transaction_type='debit').aggregate(
-                total=Sum('amount')
-            )['total'] or 0,
-            'total_income': queryset.filter(transaction_type='credit').aggregate(
-                total=Sum('amount')
-            )['total'] or 0,
-            'net_amount': (
-                queryset.filter(transaction_type='credit').aggregate(total=Sum('amount'))['total'] or 0
-            ) - (
-                queryset.filter(transaction_type='debit').aggregate(total=Sum('amount'))['total'] or 0
-            ),
+            'total_transactions': totals['tx_count'],
+            'total_expense': total_expense,
+            'total_income': total_income,
+            'net_amount': total_income - total_expense,
             'transactions_by_category': list(
                 queryset.values('category__name', 'transaction_type')
                 .annotate(
@@ -149,6 +175,7 @@ class TransactionSummaryView(APIView):
             )
         }
 
+        cache.set(cache_key, summary, SUMMARY_CACHE_TIMEOUT)
         return Response(summary)
 
 
@@ -160,7 +187,7 @@ class CategoryTransactionSummaryView(APIView):
     """
     permission_classes = [IsAuthenticated]
 
-    def get(self, request, id):
+    def get(self, request, category_uuid):
         """
         Retrieve transaction summary for a specific category.
 
@@ -170,33 +197,20 @@ class CategoryTransactionSummaryView(APIView):
         Query Parameters (optional):
         - year: Specific year to filter transactions (default: current year).
         - month: Specific month to filter transactions (default: all months).
+        - cursor: Page of transactions_details to return (see 'next'/'previous').
+        - page_size: Number of transactions_details per page (default: 100, max: 1000).
         """
 
         # Get optional query parameters
-        year = request.query_params.get('year', timezone.now().year)
-        month = request.query_params.get('month')
-
-        # Validate year
-        try:
-            year = int(year)
-            if year < 1000 or year > 9999:
-                raise ValueError("Invalid year")
-        except ValueError:
-            return Response({'error': 'Invalid year parameter'}, status=400)
-
-        # Validate month if provided
-        if month:
-            try:
-                month = int(month)
-                if month < 1 or month > 12:
-                    raise ValueError("Invalid month")
-            except ValueError:
-                return Response({'error': 'Invalid month parameter'}, status=400)
+        query = SummaryQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        year = query.validated_data.get('year', timezone.now().year)
+        month = query.validated_data.get('month')
 
         # Base queryset filtered by user and specific category
         queryset = Transaction.objects.filter(
             user=request.user,
-            category__uuid=id,  # Assuming category has a UUID field
+            category_id=category_uuid,  # Category's primary key is its UUID, no join needed
             date__year=year
         )
 
@@ -204,37 +218,46 @@ class CategoryTransactionSummaryView(APIView):
         if month:
             queryset = queryset.filter(date__month=month)
 
-        # Calculate category-specific transaction summary
-        
+        paginator = TransactionDetailsPagination()
+
+        # Calculate category-specific transaction summary in a single pass
+        zero = Value(0, output_field=DecimalField())
+        agg = queryset.aggregate(
+            total_transactions=Count('id'),
+            total_amount=Coalesce(Sum('amount'), zero),
+            debit_total=Coalesce(Sum('amount', filter=Q(transaction_type='debit')), zero),
+            debit_count=Count('id', filter=Q(transaction_type='debit')),
+            credit_total=Coalesce(Sum('amount', filter=Q(transaction_type='credit')), zero),
+            credit_count=Count('id', filter=Q(transaction_type='credit')),
+        )
+
         summary = {
-            'category_uuid': id,
-            'total_transactions': queryset.count(),
-            'total_amount': queryset.aggregate(total=Sum('amount'))['total'] or 0,
+            'category_uuid': category_uuid,
+            'total_transactions': agg['total_transactions'],
+            'total_amount': agg['total_amount'],
             'transactions_by_type': {
-                'debit': (
-                    queryset.filter(transaction_type='debit')
-                    .aggregate(
-                        total_amount=Sum('amount'),
-                        count=Count('id')
-                    )
-                ),
-                'credit': (
-                    queryset.filter(transaction_type='credit')
-                    .aggregate(
-                        total_amount=Sum('amount'),
-                        count=Count('id')
-                    )
-                )
+                'debit': {
+                    'total_amount': agg['debit_total'],
+                    'count': agg['debit_count'],
+                },
+                'credit': {
+                    'total_amount': agg['credit_total'],
+                    'count': agg['credit_count'],
+                },
             },
-            'transactions_details': list(
+            # Newest first, one keyset page at a time
+            'transactions_details': paginator.paginate_queryset(
                 queryset.values(
                     'id', 
                     'amount', 
                     'date', 
                     'description', 
                     'transaction_type'
-                ).order_by('-date')  # Order transactions by date descending
-            )
+                ),
+                request
+            ),
+            'next': paginator.get_next_link(),
+            'previous': paginator.get_previous_link(),
         }
 
-        return Response(summary,content_type='applcation/json')
+        return Response(summary,content_type='application/json')